@@ -12,6 +12,8 @@ import os
 import re
 import threading
 import queue
+import codecs
+import selectors
 
 CONTROL_KEYWORDS = [
     "if", 
@@ -42,10 +44,55 @@ BUILTIN_KEYWORDS = [
     "false", 
 ]
 
+INDENT_AFTER = frozenset(["proc", "if", "while"])
+
+KEYWORD_TAGS = {
+    **{kw: "control" for kw in CONTROL_KEYWORDS},
+    **{kw: "action" for kw in ACTION_KEYWORDS},
+    **{kw: "builtin" for kw in BUILTIN_KEYWORDS},
+}
+
+# Single pass tokenizer: the first alternative that matches wins, so keywords
+# inside strings are never tagged. Keywords are matched as plain words and
+# classified with a dict lookup, so adding keywords does not grow the pattern
+TOKEN_RE = re.compile(
+    r'(?P<string>"[^"\n]*")'
+    r"|(?P<number>\b\d+(?:\.\d+)?\b)"
+    r"|(?P<word>\b[^\W\d]\w*)"
+)
+
+def tokenize_line(line):
+    stripped = line.lstrip()
+    if not stripped:
+        return []
+
+    # Cylium only has whole-line comments, tag them without the surrounding whitespace
+    if stripped.startswith("#"):
+        return [("comment", len(line) - len(stripped), len(line.rstrip()))]
+
+    tokens = []
+    for m in TOKEN_RE.finditer(line):
+        tag = m.lastgroup
+        if tag == "word":
+            tag = KEYWORD_TAGS.get(m.group())
+            if tag is None:
+                continue
+        tokens.append((tag, m.start(), m.end()))
+    return tokens
+
 DEFAULT_FONT_SIZE = 21
 MIN_FONT_SIZE = 8
 MAX_FONT_SIZE = 32
 
+HIGHLIGHT_DELAY_MS = 30
+VIEWPORT_MARGIN = 10
+HIGHLIGHT_BATCH_LINES = 200
+HIGHLIGHT_POLL_MS = 16
+MAX_HIGHLIGHT_LINES = 5000
+
+OUTPUT_CHUNK_SIZE = 65536
+OUTPUT_POLL_MS = 50
+
 THEMES = {
     "light": {
         "bg": "#ffffff",           
@@ -84,11 +131,27 @@ class TextEditor(tk.Tk):
         self.current_theme = "light"
         self.font_size = DEFAULT_FONT_SIZE
 
+        self._highlight_job = None
+        self._linenumbers_job = None
+        self._ln_state = None
+        self._ln_items = []
+        self._dirty_range = None
+        self._viewport_job = None
+        self._viewport_top = None
+        self._line_cache = {}
+        self._line_count = 1
+        self._hl_in = queue.Queue()
+        self._hl_out = queue.Queue()
+        self._hl_generation = 0
+        self._hl_job = None
+        self._large_file = False
+        self._unsaved = False
+        self._saved_hash = hash("")
+
         self.editor_font = font.Font(family="Consolas" if sys.platform.startswith("win") else "Menlo", size=self.font_size)
 
         self._build_ui()
         self._apply_theme()
-        self._configure_tags()
         self.update_linenumbers()
 
         self.text.edit_modified(False)
@@ -96,6 +159,8 @@ class TextEditor(tk.Tk):
 
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
+        threading.Thread(target=self._highlight_worker, daemon=True).start()
+
     def _build_ui(self):
         toolbar = tk.Frame(self)
         toolbar.pack(fill="x")
@@ -128,16 +193,20 @@ class TextEditor(tk.Tk):
 
         self.text.pack(side="left", fill="both", expand=True)
 
-        scrollbar = tk.Scrollbar(text_frame, command=self._on_scroll)
-        scrollbar.pack(side="right", fill="y")
+        self.scrollbar = tk.Scrollbar(text_frame, command=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
 
-        self.text.config(yscrollcommand=scrollbar.set)
+        self.text.config(yscrollcommand=self._on_yview_change)
 
-        self.text.bind("<KeyRelease>", self.on_text_change)
-        self.text.bind("<Button-4>", self.on_text_change)
-        self.text.bind("<Button-5>", self.on_text_change)
+        self.text.bind("<<Modified>>", self._on_modified)
+        self.text.bind("<Configure>", self.on_viewport_change)
         self.text.bind("<Return>", self.handle_enter)
         self.text.bind("<Tab>", self.insert_spaces)
+        self.text.bind("<Control-t>", self.on_transpose)
+        self.text.bind("<<Paste>>", self.on_bulk_change)
+        self.text.bind("<<PasteSelection>>", self.on_bulk_change)
+        self.text.bind("<<Undo>>", self.on_undo_redo)
+        self.text.bind("<<Redo>>", self.on_undo_redo)
 
     def show_about(self):
         messagebox.showinfo(
@@ -148,15 +217,23 @@ class TextEditor(tk.Tk):
         )
 
     def handle_enter(self, event=None):
-        line_index = self.text.index("insert").split(".")[0]
+        line_index = int(float(self.text.index("insert")))
         line_start = f"{line_index}.0"
         line_text = self.text.get(line_start, f"{line_index}.end")
 
-        indent = re.match(r"[ \t]*", line_text).group(0)
-        if line_text.strip().endswith(("proc", "if", "while")):
+        body = line_text.lstrip(" \t")
+        indent = line_text[:len(line_text) - len(body)]
+
+        words = body.rsplit(None, 1)
+        if words and words[-1] in INDENT_AFTER:
             indent += " " * 4
 
         self.text.insert("insert", "\n" + indent)
+
+        line = line_index + 1
+        self._sync_line_count(line)
+        self._forget_lines(line - 1, line)
+        self.highlight_range(line - 1, line + 1)
         return "break"
 
     def insert_spaces(self, event=None):
@@ -166,21 +243,23 @@ class TextEditor(tk.Tk):
     def set_theme(self, theme):
         self.current_theme = theme
         self._apply_theme()
-        self.highlight()
         self.update_linenumbers()
 
     def _apply_theme(self):
         t = THEMES[self.current_theme]
         self.text.config(bg=t["bg"], fg=t["fg"], insertbackground=t["insert"])
         self.linenumbers.config(bg=t["linenumber_bg"])
+        self._configure_tags()
 
     def _configure_tags(self):
-        self.text.tag_configure("control")
-        self.text.tag_configure("action")
-        self.text.tag_configure("builtin")
-        self.text.tag_configure("comment")
-        self.text.tag_configure("number")
-        self.text.tag_configure("string")
+        # Existing tags pick up the new colors, so a theme switch needs no retagging
+        t = THEMES[self.current_theme]
+        self.text.tag_configure("control", foreground=t["control"])
+        self.text.tag_configure("action", foreground=t["action"])
+        self.text.tag_configure("builtin", foreground=t["builtin"])
+        self.text.tag_configure("comment", foreground=t["comment"])
+        self.text.tag_configure("number", foreground=t["number"])
+        self.text.tag_configure("string", foreground=t["string"])
 
     def open_file(self):
         path = filedialog.askopenfilename(filetypes=[("Cylium files", "*.cyl")])
@@ -189,11 +268,17 @@ class TextEditor(tk.Tk):
         with open(path, "r", encoding="utf-8", errors="ignore") as f:
             self.text.delete("1.0", "end")
             self.text.insert("1.0", f.read())
+        self._line_cache.clear()
+        self._line_count = int(float(self.text.index("end-1c")))
+        self._update_large_file(self._line_count)
         self.current_file = path
+        self.text.edit_modified(False)
+        self._unsaved = False
+        self._saved_hash = hash(self.text.get("1.0", "end-1c"))
         self.update_title()
         self.highlight()
+        self.highlight_buffer()
         self.update_linenumbers()
-        self.text.edit_modified(False)
 
     def save_file(self):
         if not self.current_file:
@@ -201,19 +286,22 @@ class TextEditor(tk.Tk):
             if not path:
                 return
             self.current_file = path
+        content = self.text.get("1.0", "end-1c")
         with open(self.current_file, "w", encoding="utf-8") as f:
-            f.write(self.text.get("1.0", "end-1c"))
+            f.write(content)
         
-        self.text.edit_modified(False)
+        self._unsaved = False
+        self._saved_hash = hash(content)
         self.update_title()
 
     def update_title(self):
         name = os.path.basename(self.current_file) if self.current_file else "Untitled.cyl"
-        mark = " *" if self.text.edit_modified() else ""
-        self.title(f"Cylium Editor — {name}{mark}")
+        mark = " *" if self._unsaved else ""
+        status = " (large file, highlighting visible lines only)" if self._large_file else ""
+        self.title(f"Cylium Editor — {name}{mark}{status}")
 
     def on_close(self):
-        if self.text.edit_modified():
+        if self._unsaved:
             answer = messagebox.askyesnocancel("Unsaved changes", "You have unsaved changes. Save before exit?")
             if answer is None:
                 return
@@ -221,65 +309,268 @@ class TextEditor(tk.Tk):
                 self.save_file()
         self.destroy()
 
+    def _on_modified(self, event=None):
+        # The flag is re-armed on every change so the event keeps firing, unsaved state is tracked separately
+        if self.text.edit_modified():
+            self.text.edit_modified(False)
+            self._unsaved = True
+            self.on_text_change()
+
     def on_text_change(self, event=None):
+        line = int(float(self.text.index("insert")))
+        if self._sync_line_count(line):
+            # A newline came or went next to the cursor without it moving (e.g. Ctrl+O), so the
+            # neighbouring lines may hold text that was tagged in a different context
+            self._extend_dirty_range(line - 1, line + 1)
+        else:
+            self._extend_dirty_range(line, line)
+
+        if self._highlight_job:
+            self.after_cancel(self._highlight_job)
+        self._highlight_job = self.after(HIGHLIGHT_DELAY_MS, self._do_highlight)
+
+        # Scrolling and resizing redraw line numbers on their own, typing only matters when lines come or go
+        if self._ln_state is None or self._ln_state[0] != self._line_count:
+            if self._linenumbers_job:
+                self.after_cancel(self._linenumbers_job)
+            self._linenumbers_job = self.after(HIGHLIGHT_DELAY_MS, self._do_update_linenumbers)
+
+        self.update_title()
+
+    def _extend_dirty_range(self, start_line, end_line):
+        start_line = max(start_line, 1)
+        if self._dirty_range is None:
+            self._dirty_range = (start_line, end_line)
+        else:
+            self._dirty_range = (min(self._dirty_range[0], start_line), max(self._dirty_range[1], end_line))
+
+    def on_transpose(self, event=None):
+        # Ctrl+T at the start of a line swaps a character across the newline onto the previous line
+        line = int(float(self.text.index("insert")))
+        self._extend_dirty_range(line - 1, line)
+
+    def _do_highlight(self):
+        self._highlight_job = None
+        start_line, end_line = self._dirty_range
+        self._dirty_range = None
+        self._forget_lines(start_line, end_line)
+        self.highlight_range(start_line, end_line)
+
+    def _forget_lines(self, start_line, end_line):
+        # An edit can come back to the cached text while leaving characters untagged
+        # (e.g. deleting and retyping the last letter of a keyword), so edited lines are always retokenized
+        for i in range(start_line, end_line + 1):
+            self._line_cache.pop(i, None)
+
+    def _do_update_linenumbers(self):
+        self._linenumbers_job = None
+        self.update_linenumbers()
+
+    def on_bulk_change(self, event=None):
+        # Pasted or undone text may span many lines, retag the viewport once it lands
+        # and let the worker catch up with the rest of the buffer
+        self._line_cache.clear()
+        self.after_idle(self.highlight)
+        self.after_idle(self.highlight_buffer)
+
+    def on_undo_redo(self, event=None):
+        self.on_bulk_change()
+        # Runs after <<Modified>> has marked the buffer unsaved
+        self.after_idle(self._check_saved)
+
+    def _check_saved(self):
+        # Undo and redo are the ways back to the saved text, so only they pay for hashing the whole buffer
+        if self._unsaved and hash(self.text.get("1.0", "end-1c")) == self._saved_hash:
+            self._unsaved = False
+            self.update_title()
+
+    def _sync_line_count(self, edit_line):
+        # Lines below an inserted or removed newline shift, so their cache entries no longer apply
+        line_count = int(float(self.text.index("end-1c")))
+        if line_count == self._line_count:
+            return False
+
+        self._line_count = line_count
+        for i in [i for i in self._line_cache if i >= edit_line]:
+            del self._line_cache[i]
+        self._update_large_file(line_count)
+        return True
+
+    def _update_large_file(self, line_count):
+        large_file = line_count > MAX_HIGHLIGHT_LINES
+        if large_file != self._large_file:
+            self._large_file = large_file
+            self.update_title()
+
+    def on_viewport_change(self, event=None):
+        if self._viewport_job:
+            self.after_cancel(self._viewport_job)
+        self._viewport_job = self.after(HIGHLIGHT_DELAY_MS, self._do_highlight_viewport)
+
+    def _do_highlight_viewport(self):
+        self._viewport_job = None
         self.highlight()
         self.update_linenumbers()
-        self.update_title()
 
     def highlight(self):
-        # Remove all tags
-        for tag in ["control", "action", "builtin", "comment", "number", "string"]:
-            self.text.tag_remove(tag, "1.0", "end")
+        # Only the visible lines (plus a margin) are tagged, the rest is picked up on scroll
+        self.highlight_range(*self._viewport_lines())
 
-        t = THEMES[self.current_theme]
+    def _viewport_lines(self):
+        top = int(float(self.text.index("@0,0")))
+        bottom = int(float(self.text.index(f"@0,{self.text.winfo_height()}")))
+        return max(top - VIEWPORT_MARGIN, 1), bottom + VIEWPORT_MARGIN
 
-        self.text.tag_configure("control", foreground=t["control"])
-        self.text.tag_configure("action", foreground=t["action"])
-        self.text.tag_configure("builtin", foreground=t["builtin"])
-        self.text.tag_configure("comment", foreground=t["comment"])
-        self.text.tag_configure("number", foreground=t["number"])
-        self.text.tag_configure("string", foreground=t["string"])
+    def highlight_range(self, start_line, end_line):
+        start_line = max(start_line, 1)
 
-        lines = self.text.get("1.0", "end").splitlines()
+        lines = self.text.get(f"{start_line}.0", f"{end_line}.end").split("\n")
+        self._retag_lines(start_line, lines)
 
-        for i, line in enumerate(lines, start=1):
-            line_start = f"{i}.0"
-            line_end = f"{i}.end"
+    def _retag_lines(self, start_line, lines, tokenized=None):
+        # tokenized holds (hash, tokens) pairs computed off-thread from an older snapshot of these lines
+        spans = {tag: [] for tag in ["control", "action", "builtin", "comment", "number", "string"]}
+        dirty_runs = []
 
-            if re.match(r"^\s*#", line):
-                self.text.tag_add("comment", line_start, line_end)
+        for k, line in enumerate(lines):
+            i = start_line + k
+
+            # Tags travel with the text, so a line that hashes the same is already tagged
+            h = hash(line)
+            if self._line_cache.get(i) == h:
                 continue
 
-            for m in re.finditer(r'"[^"\n]*"', line):
-                self.text.tag_add("string", f"{i}.{m.start()}", f"{i}.{m.end()}")
+            if tokenized is None:
+                tokens = tokenize_line(line)
+            else:
+                snapshot_hash, tokens = tokenized[k]
+                if snapshot_hash != h:
+                    # Edited since the snapshot, left to the keystroke and viewport passes
+                    continue
+            self._line_cache[i] = h
+
+            if dirty_runs and dirty_runs[-1][1] == i - 1:
+                dirty_runs[-1][1] = i
+            else:
+                dirty_runs.append([i, i])
+
+            for tag, start, end in tokens:
+                spans[tag].extend((f"{i}.{start}", f"{i}.{end}"))
+
+        for run_start, run_end in dirty_runs:
+            for tag in spans:
+                self.text.tag_remove(tag, f"{run_start}.0", f"{run_end}.end")
+
+        # One Tcl call per tag: tag_add accepts any number of index pairs
+        for tag, ranges in spans.items():
+            if ranges:
+                self.text.tag_add(tag, *ranges)
+
+    def highlight_buffer(self):
+        # Tokenize the whole buffer on the worker thread, the results are tagged one batch per tick.
+        # Bumping the generation makes the worker and the apply loop drop any earlier pass
+        self._hl_generation += 1
+        if self._hl_job is not None:
+            # The earlier pass's end marker is now stale, so its poll loop would never stop on its own
+            self.after_cancel(self._hl_job)
+            self._hl_job = None
+
+        line_count = int(float(self.text.index("end-1c")))
+        self._update_large_file(line_count)
+        if self._large_file:
+            # Viewport highlighting on scroll and typing still covers what is on screen
+            return
 
-            for m in re.finditer(r"\b\d+(\.\d+)?\b", line):
-                self.text.tag_add("number", f"{i}.{m.start()}", f"{i}.{m.end()}")
+        # The viewport pass already tagged what is on screen, only copy out the lines around it
+        top, bottom = self._viewport_lines()
+        segments = []
+        if top > 1:
+            segments.append((1, self.text.get("1.0", f"{top - 1}.end")))
+        if bottom < line_count:
+            segments.append((bottom + 1, self.text.get(f"{bottom + 1}.0", "end-1c")))
+        if not segments:
+            return
 
-            for kw in CONTROL_KEYWORDS:
-                for m in re.finditer(rf"\b{re.escape(kw)}\b", line):
-                    self.text.tag_add("control", f"{i}.{m.start()}", f"{i}.{m.end()}")
+        self._hl_in.put((self._hl_generation, segments))
+        self._hl_job = self.after(HIGHLIGHT_POLL_MS, self._apply_highlight_batch)
 
-            for kw in ACTION_KEYWORDS:
-                for m in re.finditer(rf"\b{re.escape(kw)}\b", line):
-                    self.text.tag_add("action", f"{i}.{m.start()}", f"{i}.{m.end()}")
+    def _highlight_worker(self):
+        while True:
+            generation, segments = self._hl_in.get()
+            for first_line, text in segments:
+                lines = text.split("\n")
+                for first in range(0, len(lines), HIGHLIGHT_BATCH_LINES):
+                    if generation != self._hl_generation:
+                        break
+                    batch = [(hash(line), tokenize_line(line)) for line in lines[first:first + HIGHLIGHT_BATCH_LINES]]
+                    self._hl_out.put((generation, first_line + first, batch))
+            self._hl_out.put((generation, None, None))
+
+    def _apply_highlight_batch(self):
+        self._hl_job = None
+        while True:
+            try:
+                generation, first_line, batch = self._hl_out.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._hl_generation:
+                continue
+            if first_line is None:
+                return
 
-            for kw in BUILTIN_KEYWORDS:
-                for m in re.finditer(rf"\b{re.escape(kw)}\b", line):
-                    self.text.tag_add("builtin", f"{i}.{m.start()}", f"{i}.{m.end()}")
+            last_line = first_line + len(batch) - 1
+            lines = self.text.get(f"{first_line}.0", f"{last_line}.end").split("\n")
+            self._retag_lines(first_line, lines, batch)
+            break
+        self._hl_job = self.after(HIGHLIGHT_POLL_MS, self._apply_highlight_batch)
 
     def update_linenumbers(self):
-        self.linenumbers.delete("all")
+        top_line = int(float(self.text.index("@0,0")))
+        line_count = int(float(self.text.index("end-1c")))
+        top_dline = self.text.dlineinfo(f"{top_line}.0")
+        state = (
+            line_count,
+            top_line,
+            top_dline[1] if top_dline else None,
+            self.text.winfo_height(),
+            self.font_size,
+            self.current_theme,
+        )
+        if state == self._ln_state:
+            return
+        self._ln_state = state
+
         t = THEMES[self.current_theme]
-        i = self.text.index("@0,0")
-        while True:
-            dline = self.text.dlineinfo(i)
+        k = 0
+        # wrap="none" keeps one display line per text line, so line numbers can just be counted
+        for line in range(top_line, line_count + 1):
+            dline = self.text.dlineinfo(f"{line}.0")
             if dline is None:
                 break
             y = dline[1]
-            line_number = str(i).split(".")[0]
-            self.linenumbers.create_text(45, y, anchor="ne", text=line_number, fill=t["linenumber_fg"], font=self.editor_font)
-            i = self.text.index(f"{i}+1line")
+            line_number = str(line)
+
+            # Canvas items are reused between redraws rather than deleted and recreated
+            if k < len(self._ln_items):
+                item = self._ln_items[k]
+                self.linenumbers.coords(item, 45, y)
+                self.linenumbers.itemconfigure(item, text=line_number, fill=t["linenumber_fg"], state="normal")
+            else:
+                item = self.linenumbers.create_text(45, y, anchor="ne", text=line_number, fill=t["linenumber_fg"], font=self.editor_font)
+                self._ln_items.append(item)
+            k += 1
+
+        for item in self._ln_items[k:]:
+            self.linenumbers.itemconfigure(item, state="hidden")
+
+    def _on_yview_change(self, first, last):
+        self.scrollbar.set(first, last)
+
+        # Fires on every edit too, so only react when the first visible line moved
+        top = self.text.index("@0,0")
+        if top != self._viewport_top:
+            self._viewport_top = top
+            self.on_viewport_change()
 
     def _on_scroll(self, *args):
         self.text.yview(*args)
@@ -321,6 +612,7 @@ class TextEditor(tk.Tk):
         output_text.config(state="disabled")
 
         input_queue = queue.Queue()
+        output_queue = queue.Queue()
 
         def write_output(text):
             output_text.config(state="normal")
@@ -328,6 +620,40 @@ class TextEditor(tk.Tk):
             output_text.see("end")
             output_text.config(state="disabled")
 
+        # Tk is not thread safe: worker threads only queue text and the UI drains it on a timer.
+        # None marks the end of the run, after which polling stops
+        window_closed = threading.Event()
+
+        def emit(text):
+            # Output still has to be read so the program does not block, but nobody shows it anymore
+            if not window_closed.is_set():
+                output_queue.put(text)
+
+        def on_destroy(event):
+            if event.widget is run_window:
+                window_closed.set()
+
+        run_window.bind("<Destroy>", on_destroy)
+
+        def drain_output():
+            if window_closed.is_set():
+                return
+            chunks = []
+            finished = False
+            while True:
+                try:
+                    chunk = output_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if chunk is None:
+                    finished = True
+                    break
+                chunks.append(chunk)
+            if chunks:
+                write_output("".join(chunks))
+            if not finished:
+                run_window.after(OUTPUT_POLL_MS, drain_output)
+
         def on_enter(event):
             line = input_entry.get()
             input_entry.delete(0, "end")
@@ -353,17 +679,44 @@ class TextEditor(tk.Tk):
                     bufsize=1
                 )
             except Exception as e:
-                write_output(f"Failed to start process: {e}\n")
+                emit(f"Failed to start process: {e}\n")
+                emit(None)
                 return
 
             def read_output(pipe):
-                for line in iter(pipe.readline, ''):
-                    write_output(line)
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                while True:
+                    chunk = os.read(pipe.fileno(), OUTPUT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    emit(decoder.decode(chunk))
+                emit(decoder.decode(b"", final=True))
                 pipe.close()
 
-            import threading
-            threading.Thread(target=read_output, args=(proc.stdout,), daemon=True).start()
-            threading.Thread(target=read_output, args=(proc.stderr,), daemon=True).start()
+            def read_outputs(pipes):
+                decoders = {pipe: codecs.getincrementaldecoder("utf-8")(errors="replace") for pipe in pipes}
+                with selectors.DefaultSelector() as sel:
+                    for pipe in pipes:
+                        sel.register(pipe, selectors.EVENT_READ)
+                    while sel.get_map():
+                        for key, _ in sel.select():
+                            chunk = os.read(key.fd, OUTPUT_CHUNK_SIZE)
+                            decoder = decoders[key.fileobj]
+                            if chunk:
+                                emit(decoder.decode(chunk))
+                            else:
+                                emit(decoder.decode(b"", final=True))
+                                sel.unregister(key.fileobj)
+                                key.fileobj.close()
+
+            pipes = [proc.stdout, proc.stderr]
+            if sys.platform.startswith("win"):
+                # select() only works on sockets on Windows, keep one blocking reader per pipe there
+                readers = [threading.Thread(target=read_output, args=(pipe,), daemon=True) for pipe in pipes]
+            else:
+                readers = [threading.Thread(target=read_outputs, args=(pipes,), daemon=True)]
+            for reader in readers:
+                reader.start()
 
             def feed_input():
                 while proc.poll() is None:
@@ -377,9 +730,13 @@ class TextEditor(tk.Tk):
             threading.Thread(target=feed_input, daemon=True).start()
 
             proc.wait()
-            write_output(f"\nProcess finished with exit code {proc.returncode}\n")
+            for reader in readers:
+                reader.join()
+            emit(f"\nProcess finished with exit code {proc.returncode}\n")
+            emit(None)
 
         threading.Thread(target=run_subprocess, daemon=True).start()
+        drain_output()
 
 if __name__ == "__main__":
     app = TextEditor()